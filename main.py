@@ -1,21 +1,73 @@
 from typing import Dict, List, Optional, Tuple
 import random
+from functools import lru_cache
+from operator import mul
 import argparse
+import logging
 import sys
-from time import sleep
+
+try:
+    # GMP-backed integers are much faster than CPython ints at 127 bits
+    from gmpy2 import mpz, powmod
+except ImportError:
+    mpz = int
+    powmod = pow
+
+log = logging.getLogger(__name__)
 
 # -------------------------
 # Shamir Secret Sharing (Erasure Code)
 # -------------------------
 
-_PRIME = 2**127 - 1  # Large prime for finite field arithmetic
-
-def _eval_polynomial(coeffs: List[int], x: int, prime: int) -> int:
-    """Evaluate polynomial with coefficients `coeffs` at point `x` modulo `prime`."""
-    result = 0
-    for power, coef in enumerate(coeffs):
-        result = (result + coef * pow(x, power, prime)) % prime
-    return result
+_PRIME = mpz(2)**127 - 1  # Large prime for finite field arithmetic
+
+# Mersenne prime whose residue products still fit in int64, for demo runs
+_SMALL_PRIME = 2**31 - 1
+
+# Small-field share encoder compiled by _enable_jit(); None until then
+_encode_64 = None
+# Below this many nodes, importing Numba costs more than the encoder saves
+_JIT_MIN_NODES = 300
+
+def _enable_jit() -> bool:
+    """Compile the Numba share encoder for the small field, if Numba is installed."""
+    # Imported here rather than at module load: importing Numba costs more
+    # than the default 127-bit path it would never be used on
+    global _encode_64
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return False
+
+    @njit(cache=True)
+    def kernel(coeffs, out, prime):
+        # Horner's scheme at x = 1..n on int64; both factors are below 2^31
+        for i in range(out.shape[0]):
+            x = i + 1
+            result = 0
+            for p in range(coeffs.shape[0] - 1, -1, -1):
+                result = (result * x + coeffs[p]) % prime
+            out[i] = result
+
+    def encode(coeffs: List[int], n: int, prime: int) -> List[int]:
+        out = np.empty(n, dtype=np.int64)
+        kernel(np.array([int(c) for c in coeffs], dtype=np.int64), out, prime)
+        return out.tolist()
+
+    _encode_64 = encode
+    return True
+
+@lru_cache(maxsize=None)
+def _power_table(n: int, k: int, prime: int) -> Tuple[Tuple[int, ...], ...]:
+    """Vandermonde rows (1, i, i^2, ..., i^(k-1)) modulo `prime` for i = 1..n."""
+    rows = []
+    for i in range(1, n + 1):
+        row = [mpz(1)]
+        for _ in range(1, k):
+            row.append((row[-1] * i) % prime)
+        rows.append(tuple(row))
+    return tuple(rows)
 
 def ECEnc(n: int, k: int, secret: int) -> List[Tuple[int, int]]:
     """Generate n shares (x, y) from secret with threshold k."""
@@ -23,34 +75,77 @@ def ECEnc(n: int, k: int, secret: int) -> List[Tuple[int, int]]:
         raise ValueError("Secret out of range")
     # Create a deterministic polynomial with secret as the constant term
     # Use the secret as seed for reproducible coefficients
-    random.seed(secret)
-    coeffs = [secret] + [random.randrange(_PRIME) for _ in range(k - 1)]
+    # A local generator keeps the global random state (Byzantine votes) untouched
+    rng = random.Random(int(secret))
+    coeffs = [mpz(secret)] + [mpz(rng.randrange(_PRIME)) for _ in range(k - 1)]
     # Generate n (x, y) shares by evaluating polynomial at x=1 to x=n
-    shares = [(i, _eval_polynomial(coeffs, i, _PRIME)) for i in range(1, n + 1)]
-    print(f"[ECEnc] Generated shares: {shares}")
+    if _encode_64 is not None and _PRIME <= _SMALL_PRIME:
+        shares = list(enumerate(_encode_64(coeffs, n, _PRIME), 1))
+        log.debug("[ECEnc] Generated shares: %s", shares)
+        return shares
+    # Otherwise each share is a dot product against the cached power table
+    table = _power_table(n, k, _PRIME)
+    shares = [(i, int(sum(map(mul, row, coeffs)) % _PRIME)) for i, row in enumerate(table, 1)]
+    log.debug("[ECEnc] Generated shares: %s", shares)
     return shares
 
-def _lagrange_interpolate(x: int, x_s: List[int], y_s: List[int], prime: int) -> int:
-    """Lagrange interpolation to recover secret from shares."""
-    total = 0
+def _batch_inverse(values: List[int], prime: int) -> List[int]:
+    """Invert every value modulo `prime` with a single modular exponentiation."""
+    # Montgomery's trick: prefix products, one inversion, then walk back
+    k = len(values)
+    prefix = [mpz(1)] * (k + 1)
+    for i, v in enumerate(values):
+        prefix[i + 1] = (prefix[i] * v) % prime
+    inv_all = powmod(prefix[k], prime - 2, prime)  # Compute modular inverse
+    inverses = [0] * k
+    for i in range(k - 1, -1, -1):
+        inverses[i] = (prefix[i] * inv_all) % prime
+        inv_all = (inv_all * values[i]) % prime
+    return inverses
+
+@lru_cache(maxsize=None)
+def _barycentric_weights(x_s: Tuple[int, ...], prime: int) -> Tuple[int, ...]:
+    """Barycentric weights w_i = 1 / prod_{j != i}(x_i - x_j) modulo `prime`."""
     k = len(x_s)
+    dens = []
     for i in range(k):
-        xi, yi = x_s[i], y_s[i]
-        num, den = 1, 1
+        xi = x_s[i]
+        den = 1
         for j in range(k):
             if i != j:
-                xj = x_s[j]
-                num = (num * (x - xj)) % prime
-                den = (den * (xi - xj)) % prime
-        inv_den = pow(den, prime - 2, prime)  # Compute modular inverse
-        total = (total + yi * num * inv_den) % prime
-    return total
+                den = (den * (xi - x_s[j])) % prime
+        dens.append(den)
+    return tuple(_batch_inverse(dens, prime))
+
+@lru_cache(maxsize=None)
+def _lagrange_coefficients(x: int, x_s: Tuple[int, ...], prime: int) -> Tuple[int, ...]:
+    """Lagrange basis values L_i(x) for the evaluation points `x_s`."""
+    # Only C(n, k) share subsets exist, so the cache stays bounded
+    weights = _barycentric_weights(x_s, prime)
+    k = len(x_s)
+    # At x = 0 (secret recovery) each factor x - x_j is just -x_j
+    factors = [-xj for xj in x_s] if x == 0 else [x - xj for xj in x_s]
+    coeffs = []
+    for i in range(k):
+        num = weights[i]
+        for j in range(k):
+            if i != j:
+                num = (num * factors[j]) % prime
+        coeffs.append(num)
+    return tuple(coeffs)
+
+def _lagrange_interpolate(x: int, x_s: List[int], y_s: List[int], prime: int) -> int:
+    """Lagrange interpolation to recover secret from shares."""
+    # Single C-level dot product with one reduction at the end
+    coeffs = _lagrange_coefficients(x, tuple(x_s), prime)
+    total = sum(map(mul, map(mpz, y_s), coeffs)) % prime
+    return int(total)
 
 def ECDec(n: int, k: int, shares: List[Tuple[int, int]]) -> int:
     """Recover secret from any k shares."""
     x_s, y_s = zip(*shares[:k])
     secret = _lagrange_interpolate(0, list(x_s), list(y_s), _PRIME)
-    print(f"[ECDec] Recovered secret from {shares[:k]}: {secret}")
+    log.debug("[ECDec] Recovered secret from %s: %s", shares[:k], secret)
     return secret
 
 # -------------------------
@@ -63,11 +158,19 @@ class RBC:
     def __init__(self, owner: int):
         self.owner = owner
 
-    def broadcast(self, share: Tuple[int, int]):
-        # Broadcast a share to all nodes
-        print(f"[RBC] Node {self.owner} broadcasting {share}")
+    def broadcast(self, y: int):
+        # Broadcast a share to all nodes; its x-value is the owner's ID
+        log.debug("[RBC] Node %s broadcasting (%s, %s)", self.owner, self.owner, y)
         for node in NODES.values():
-            node.on_rbc_delivery(self.owner, share)
+            node.on_rbc_delivery(self.owner, y)
+
+    @staticmethod
+    def broadcast_batch(shares_by_owner: Dict[int, int]):
+        # Broadcast every owner's share y-value in one pass over the nodes
+        for owner, y in shares_by_owner.items():
+            log.debug("[RBC] Node %s broadcasting (%s, %s)", owner, owner, y)
+        for node in NODES.values():
+            node.on_rbc_delivery_batch(shares_by_owner)
 
 # -------------------------
 # Common Coin for Byzantine Agreement
@@ -77,27 +180,26 @@ class CommonCoin:
     def __init__(self, n: int, t: int):
         self.n = n
         self.t = t
+        self._weak = t + 1  # Shares needed to fix the coin
         self.coin_shares: Dict[int, int] = {}  # Node ID -> coin share
         self._coin_value: Optional[int] = None
+        self._xor_accum = 0  # XOR of the first t+1 shares, built incrementally
         
     def contribute_share(self, node_id: int, round_num: int):
         """Each node contributes a deterministic share based on node ID and round"""
+        if node_id in self.coin_shares:
+            return
         # Use a simple but deterministic function for the coin share
         # In practice, this would use threshold signatures or VRF
         share = (node_id * 7 + round_num * 13) % 2
         self.coin_shares[node_id] = share
-        print(f"[CommonCoin] Node {node_id} contributed share {share} for round {round_num}")
-        self._try_compute_coin()
-    
-    def _try_compute_coin(self):
-        """Compute coin value when we have enough shares"""
-        if len(self.coin_shares) >= self.t + 1 and self._coin_value is None:
-            # XOR all shares to get coin value (simple but effective)
-            coin_value = 0
-            for share in list(self.coin_shares.values())[:self.t + 1]:
-                coin_value ^= share
-            self._coin_value = coin_value
-            print(f"[CommonCoin] Computed coin value: {self._coin_value}")
+        log.debug("[CommonCoin] Node %s contributed share %s for round %s", node_id, share, round_num)
+        if self._coin_value is None:
+            # XOR the first t+1 shares to get coin value (simple but effective)
+            self._xor_accum ^= share
+            if len(self.coin_shares) == self._weak:
+                self._coin_value = self._xor_accum
+                log.debug("[CommonCoin] Computed coin value: %s", self._coin_value)
     
     def get_coin_value(self) -> Optional[int]:
         return self._coin_value
@@ -114,22 +216,28 @@ class ABBA:
         self.owner = owner
         self.n = n
         self.t = t
+        # Decision thresholds, fixed for the lifetime of the instance
+        self._strong = n - t
+        self._weak = t + 1
         self.inputs: Dict[int, int] = {}  # sender_id -> vote
+        self._ones = 0  # Running vote tallies, updated on each input
+        self._zeros = 0
         self._output: Optional[int] = None
         self.common_coin = CommonCoin(n, t)
-        self.coin_requested = False
 
     def input(self, sender: int, v: int):
         """Accept a binary vote from a sender"""
-        if sender in self.inputs:
+        if self._output is not None or sender in self.inputs:
             return
         self.inputs[sender] = v
-        print(f"[ABBA-{self.owner}] Received vote {v} from Node {sender}")
+        if v == 1:
+            self._ones += 1
+        else:
+            self._zeros += 1
+        log.debug("[ABBA-%s] Received vote %s from Node %s", self.owner, v, sender)
         
-        # Contribute to common coin when we receive our first input
-        if not self.coin_requested:
-            self.common_coin.contribute_share(sender, 1)  # Simple round 1
-            self.coin_requested = True
+        # Every voter contributes its coin share so the coin can reach t+1 shares
+        self.common_coin.contribute_share(sender, 1)  # Simple round 1
         
         self._try_decide()
 
@@ -138,33 +246,32 @@ class ABBA:
         if self._output is not None:
             return
             
-        ones = sum(1 for v in self.inputs.values() if v == 1)
-        zeros = sum(1 for v in self.inputs.values() if v == 0)
-        total_votes = len(self.inputs)
-        print(f"[ABBA-{self.owner}] Current votes: {ones} ones, {zeros} zeros, {total_votes} total")
+        ones, zeros = self._ones, self._zeros
+        total_votes = ones + zeros
+        log.debug("[ABBA-%s] Current votes: %s ones, %s zeros, %s total", self.owner, ones, zeros, total_votes)
         
         # Strong majority decisions
-        if ones >= self.n - self.t:
+        if ones >= self._strong:
             self._output = 1
-            print(f"[ABBA-{self.owner}] Decided 1 (ones={ones} >= {self.n - self.t})")
-        elif zeros >= self.n - self.t:
+            log.debug("[ABBA-%s] Decided 1 (ones=%s >= %s)", self.owner, ones, self._strong)
+        elif zeros >= self._strong:
             self._output = 0
-            print(f"[ABBA-{self.owner}] Decided 0 (zeros={zeros} >= {self.n - self.t})")
-        elif total_votes >= self.n - self.t:
+            log.debug("[ABBA-%s] Decided 0 (zeros=%s >= %s)", self.owner, zeros, self._strong)
+        elif total_votes >= self._strong:
             # Use common coin for tie-breaking when we have enough votes
             if self.common_coin.has_coin_value():
                 coin_value = self.common_coin.get_coin_value()
-                print(f"[ABBA-{self.owner}] Using common coin value {coin_value} to break tie")
-                if ones >= self.t + 1:
+                log.debug("[ABBA-%s] Using common coin value %s to break tie", self.owner, coin_value)
+                if ones >= self._weak:
                     self._output = 1
-                    print(f"[ABBA-{self.owner}] Decided 1 using coin (ones={ones} >= {self.t + 1})")
-                elif zeros >= self.t + 1:
+                    log.debug("[ABBA-%s] Decided 1 using coin (ones=%s >= %s)", self.owner, ones, self._weak)
+                elif zeros >= self._weak:
                     self._output = 0  
-                    print(f"[ABBA-{self.owner}] Decided 0 using coin (zeros={zeros} >= {self.t + 1})")
+                    log.debug("[ABBA-%s] Decided 0 using coin (zeros=%s >= %s)", self.owner, zeros, self._weak)
                 else:
                     # Fallback to coin value
                     self._output = coin_value
-                    print(f"[ABBA-{self.owner}] Decided {coin_value} using coin fallback")
+                    log.debug("[ABBA-%s] Decided %s using coin fallback", self.owner, coin_value)
 
     def has_output(self) -> bool:
         """Check if this ABBA instance has made a decision"""
@@ -174,6 +281,8 @@ class ABBA:
         """Get the decision (0 or 1)"""
         return self._output
 
+GLOBAL_ABBA: Dict[int, ABBA] = {}  # Shared ABBA instance per sender, used by all nodes
+
 # -------------------------
 # OciorABA⋆ Node
 # -------------------------
@@ -184,20 +293,30 @@ class OciorABAStarNode:
         self.n = n
         self.t = t
         self.is_byzantine = is_byzantine
+        self._weak = t + 1  # Threshold k for ECEnc/ECDec and early termination
+        # Per-sender state is kept in dense lists indexed by node ID (index 0 unused)
         # Votes from each node
-        self.vi: Dict[int, Optional[int]] = {j: None for j in range(1, n + 1)}
-        # Shares generated by this node
-        self._shares: List[Tuple[int, int]] = []
-        # Shares received before ready
-        self.pending_shares: List[Tuple[int, Tuple[int, int]]] = []
-        # Store shares received from other nodes
-        self.rbc_shares: Dict[int, Tuple[int, int]] = {}
+        self.vi: List[Optional[int]] = [None] * (n + 1)
+        # y-values of the shares generated by this node; share j is (j, _y[j - 1])
+        self._y: List[int] = []
+        # Shares received before ready, as (sender, y)
+        self.pending_shares: List[Tuple[int, int]] = []
+        # Store share y-values received from other nodes
+        self.rbc_shares: List[Optional[int]] = [None] * (n + 1)
 
         self.rbc = RBC(node_id)
-        # ABBA per sender
-        self.abba: Dict[int, ABBA] = {j: ABBA(j, n, t) for j in range(1, n + 1)}
+        # ABBA per sender, shared with every other node
+        self.abba: Dict[int, ABBA] = {}
+        for j in range(1, n + 1):
+            if j not in GLOBAL_ABBA:
+                GLOBAL_ABBA[j] = ABBA(j, n, t)
+            self.abba[j] = GLOBAL_ABBA[j]
         # Final outputs from each ABBA instance
-        self.abba_out: Dict[int, int] = {}
+        self.abba_out: List[Optional[int]] = [None] * (n + 1)
+        # Number of ABBA instances that decided
+        self.abba_decided = 0
+        # Number of ABBA instances that decided 1
+        self.ones_decided = 0
         # Store the final decision
         self.final_decision: Optional[int] = None
         # Track if protocol has completed
@@ -207,108 +326,138 @@ class OciorABAStarNode:
 
     def propose(self, secret: int) -> None:
         # Propose a secret by encoding it and broadcasting one share
-        print(f"\n[Node {self.id}] {'(BYZANTINE) ' if self.is_byzantine else ''}Proposing secret {secret}")
+        self.rbc.broadcast(self._compute_shares(secret))
+        
+        # Process any pending shares now that we have our own shares
+        for sender, y in self.pending_shares:
+            self._process_share(sender, y)
+        self.pending_shares.clear()
+
+    def _compute_shares(self, secret: int) -> int:
+        # Encode the secret and return this node's own share y-value, without broadcasting
+        log.debug("\n[Node %s] %sProposing secret %s", self.id, '(BYZANTINE) ' if self.is_byzantine else '', secret)
         
         if self.is_byzantine:
             # Byzantine behavior: propose a different/corrupted secret
             corrupted_secret = (secret + self.id * 1000) % _PRIME  # Different secret per Byzantine node
-            self._shares = ECEnc(self.n, self.t + 1, corrupted_secret)
-            print(f"[Node {self.id}] BYZANTINE: Using corrupted secret {corrupted_secret} instead of {secret}")
+            self._y = [y for _, y in ECEnc(self.n, self._weak, corrupted_secret)]
+            log.debug("[Node %s] BYZANTINE: Using corrupted secret %s instead of %s", self.id, corrupted_secret, secret)
         else:
-            self._shares = ECEnc(self.n, self.t + 1, secret)
-        
-        x_i, y_i = self._shares[self.id - 1]
-        self.rbc.broadcast((x_i, y_i))
-        
-        # Process any pending shares now that we have our own shares
-        for sender, share in self.pending_shares:
-            self._process_share(sender, share)
-        self.pending_shares.clear()
+            self._y = [y for _, y in ECEnc(self.n, self._weak, secret)]
+        return self._y[self.id - 1]
 
-    def on_rbc_delivery(self, sender: int, share: Tuple[int, int]) -> None:
+    def on_rbc_delivery(self, sender: int, y: int) -> None:
         # Store the delivered share
-        self.rbc_shares[sender] = share
+        self.rbc_shares[sender] = y
 
         # Handle a received share from another node
-        if not self._shares:
-            print(f"[Node {self.id}] Received share from Node {sender}, storing for later processing")
-            self.pending_shares.append((sender, share))
+        if not self._y:
+            log.debug("[Node %s] Received share from Node %s, storing for later processing", self.id, sender)
+            self.pending_shares.append((sender, y))
             return
         
-        self._process_share(sender, share)
+        self._process_share(sender, y)
+
+    def on_rbc_delivery_batch(self, shares_by_owner: Dict[int, int]) -> None:
+        # Vote on every delivered share, then check ABBA decisions once
+        if not self._y:
+            log.debug("[Node %s] Received %s shares, storing for later processing", self.id, len(shares_by_owner))
+            for sender, y in shares_by_owner.items():
+                self.rbc_shares[sender] = y
+                self.pending_shares.append((sender, y))
+            return
+        for sender, y in shares_by_owner.items():
+            self.rbc_shares[sender] = y
+            self._vote(sender, y)
+        self._process_abba(inject_defaults=False)
     
-    def _process_share(self, sender: int, share: Tuple[int, int]) -> None:
+    def _process_share(self, sender: int, y: int) -> None:
         # Process a share from a sender
-        x_j, y_jj = share
-        x_i_j, y_i_j = self._shares[sender - 1]
-        assert x_i_j == x_j  # Ensure x values match
-        print(f"[Node {self.id}] Processing share from Node {sender}: {share}")
-        print(f"[Node {self.id}] Expected share for Node {sender}: ({x_i_j}, {y_i_j})")
+        self._vote(sender, y)
+        
+        # Check for new ABBA decisions after each vote; defaults are withheld
+        # here since the shared ABBA would take them over our real later votes
+        self._process_abba(inject_defaults=False)
+
+    def _vote(self, sender: int, y: int) -> None:
+        # Check a share against our own and send the vote to its ABBA instance;
+        # shares are evaluated at x = sender, so only the y-values are compared
+        expected = self._y[sender - 1]
+        log.debug("[Node %s] Processing share from Node %s: (%s, %s)", self.id, sender, sender, y)
+        log.debug("[Node %s] Expected share for Node %s: (%s, %s)", self.id, sender, sender, expected)
         
         if self.is_byzantine:
             # Byzantine behavior: vote randomly instead of honestly
             vote = random.choice([0, 1])
-            print(f"[Node {self.id}] BYZANTINE: Random vote for Node {sender} = {vote}")
+            log.debug("[Node %s] BYZANTINE: Random vote for Node %s = %s", self.id, sender, vote)
         else:
             # Honest behavior: vote based on whether share matches
-            vote = 1 if y_jj == y_i_j else 0  # Vote 1 if share matches expected
-            print(f"[Node {self.id}] Vote for Node {sender} = {vote}")
+            vote = 1 if y == expected else 0  # Vote 1 if share matches expected
+            log.debug("[Node %s] Vote for Node %s = %s", self.id, sender, vote)
         
         self.vi[sender] = vote
         
-        # Send vote to all nodes' ABBA instances for this sender
-        for node in NODES.values():
-            node.abba[sender].input(self.id, vote)
-        
-        # Check for new ABBA decisions after each vote
-        self._process_abba()
+        # Send vote to the ABBA instance for this sender (shared by all nodes)
+        GLOBAL_ABBA[sender].input(self.id, vote)
 
-    def _process_abba(self):
+    def _process_abba(self, inject_defaults: bool = True):
         # Process ABBA decisions
-        new_outputs = False
+        if self.protocol_complete:
+            return
         for j, ab in self.abba.items():
-            if j not in self.abba_out and ab.has_output():
-                self.abba_out[j] = ab.get_output()  # type: ignore
-                print(f"[Node {self.id}] ABBA[{j}] output = {self.abba_out[j]}")
-                new_outputs = True
+            if self.abba_out[j] is None and ab.has_output():
+                self.abba_out[j] = ab.get_output()
+                self.abba_decided += 1
+                log.debug("[Node %s] ABBA[%s] output = %s", self.id, j, self.abba_out[j])
+                if self.abba_out[j] == 1:
+                    self.ones_decided += 1
+
+        # Early termination: t+1 ABBA instances decided 1 and their shares
+        # were delivered, so there is no need to wait for the rest
+        if self.ones_decided >= self._weak:
+            Bones = [j for j in range(1, self.n + 1) if self.abba_out[j] == 1][: self._weak]
+            if all(self.rbc_shares[j] is not None for j in Bones):
+                self._finalize()
+                return
         
         # Aggressive termination: inject default votes for undecided ABBA
-        self._inject_default_votes()
+        if inject_defaults:
+            self._inject_default_votes()
         
         # Check if all ABBA instances have decided
-        if len(self.abba_out) == self.n:
+        if self.abba_decided == self.n:
             self._finalize()
     
     def _inject_default_votes(self):
         # Inject default votes (0) for undecided ABBA instances
-        if len(self.abba_out) > 0:  # As soon as any ABBA decides
+        if self.abba_decided > 0:  # As soon as any ABBA decides
             for j in range(1, self.n + 1):
-                if j not in self.abba_out:
+                if self.abba_out[j] is None:
                     # Always inject 0 to force decision
                     self.abba[j].input(self.id, 0)
 
     def _finalize(self):
         # Finalize the decision based on ABBA outputs
-        Aones = {j for j, v in self.abba_out.items() if v == 1}
-        print(f"[Node {self.id}] Aones = {Aones}")
+        Aones = {j for j in range(1, self.n + 1) if self.abba_out[j] == 1}
+        log.debug("[Node %s] Aones = %s", self.id, Aones)
 
-        if len(Aones) < self.t + 1:
-            print(f"[Node {self.id}] Decides ⊥")  # Not enough valid shares
+        if len(Aones) < self._weak:
+            log.debug("[Node %s] Decides ⊥", self.id)  # Not enough valid shares
             self.final_decision = None  # Store the failure decision
             self.protocol_complete = True
             return
         
-        Bones = sorted(Aones)[: self.t + 1]  # Select t+1 valid shares
-        print(f"[Node {self.id}] Bones = {Bones}")
+        Bones = sorted(Aones)[: self._weak]  # Select t+1 valid shares
+        log.debug("[Node %s] Bones = %s", self.id, Bones)
 
-        missing = [j for j in Bones if j not in self.rbc_shares]
+        missing = [j for j in Bones if self.rbc_shares[j] is None]
         if missing:
             self.protocol_complete = True
             return
         
-        shares = [self._shares[j - 1] for j in Bones]
-        recovered = ECDec(self.n, self.t + 1, shares)  # Reconstruct the secret
-        print(f"[Node {self.id}] Decides {recovered}")
+        shares = [(j, self._y[j - 1]) for j in Bones]
+        recovered = ECDec(self.n, self._weak, shares)  # Reconstruct the secret
+        log.debug("[Node %s] Decides %s", self.id, recovered)
         self.final_decision = recovered  # Store the successful decision
         self.protocol_complete = True
 
@@ -325,16 +474,28 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument('--byzantine-behavior', choices=['random-vote', 'corrupt-share', 'both'], 
                         default='both',
                         help="Type of Byzantine behavior (default: both)")
+    parser.add_argument('--small-field', action='store_true',
+                        help="Use the 31-bit field; shares are encoded with Numba when installed "
+                             "and n >= 300")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Log every protocol message (default: off)")
     return parser.parse_args()
 
 if __name__ == "__main__":
     cfg = parse_args()
+    logging.basicConfig(stream=sys.stdout, format="%(message)s",
+                        level=logging.DEBUG if cfg.verbose else logging.WARNING)
     n, t, secret = cfg.nodes, cfg.faults, cfg.secret
+    if cfg.small_field:
+        _PRIME = _SMALL_PRIME
+        if n >= _JIT_MIN_NODES:
+            _enable_jit()
 
     if n < 3 * t + 1:
         sys.exit("Error: n must be at least 3t + 1 for Byzantine fault tolerance")
 
     NODES.clear()
+    GLOBAL_ABBA.clear()
     
     # Designate first t nodes as Byzantine
     byzantine_nodes = set(range(1, t + 1))
@@ -347,30 +508,35 @@ if __name__ == "__main__":
     print(f"\n=== Simulation Start: n={n}, t={t}, secret={secret} ===")
     print(f"Byzantine nodes: {sorted(byzantine_nodes)} | Honest nodes: {sorted(set(range(1, n+1)) - byzantine_nodes)}")
     
-    for i in range(1, n + 1):
-        NODES[i].propose(secret)
+    # Every node encodes first, then all shares go out in one batched broadcast
+    shares_by_owner = {i: NODES[i]._compute_shares(secret) for i in range(1, n + 1)}
+    RBC.broadcast_batch(shares_by_owner)
     
-    # Wait for all nodes to complete the protocol
-    timeout = 5.0  # seconds
-    interval = 0.1
-    elapsed = 0.0
-    while not all(node.protocol_complete for node in NODES.values()) and elapsed < timeout:
-        # Continuously process ABBA decisions and inject defaults
+    # Drive the protocol to a fixed point: the simulation is synchronous, so
+    # a pass that changes nothing means no later pass will either
+    def _progress() -> Tuple[int, int, int]:
+        return (sum(ab.has_output() for ab in GLOBAL_ABBA.values()),
+                sum(node.abba_decided for node in NODES.values()),
+                sum(node.protocol_complete for node in NODES.values()))
+
+    while not all(node.protocol_complete for node in NODES.values()):
+        before = _progress()
+        # Process ABBA decisions and inject defaults
         for node in NODES.values():
             if not node.protocol_complete:
                 node._process_abba()
-        
-        sleep(interval)
-        elapsed += interval
+        if _progress() == before:
+            break
 
     # Check for hang
     if not all(node.protocol_complete for node in NODES.values()):
-        print("Error: Protocol did not complete on all nodes within timeout.")
+        print("Error: Protocol did not complete on all nodes (no further progress).")
         incomplete_nodes = [i for i in range(1, n+1) if not NODES[i].protocol_complete]
         print(f"Incomplete nodes: {incomplete_nodes}")
         for i in incomplete_nodes:
             node = NODES[i]
-            print(f"[Node {i}] ABBA outputs: {node.abba_out}")
+            decided = {j: v for j, v in enumerate(node.abba_out) if v is not None}
+            print(f"[Node {i}] ABBA outputs: {decided}")
         sys.exit(1)
 
     # Display final results